@@ -6,5 +6,5 @@ retriever = Retriever()
 
 @router.post("/build")
 def build_index():
-    retriever.build_index()
-    return {"status": "Index built successfully!"}
+    stats = retriever.build_index()
+    return {"status": "Index built successfully!", "stats": stats}
@@ -20,6 +20,7 @@ QDRANT_URL = get_secret("QDRANT_URL", "http://localhost:6333")
 QDRANT_API_KEY = get_secret("QDRANT_API_KEY", None)
 COLLECTION_NAME = get_secret("COLLECTION_NAME", "finrag_docs")
 DATA_PATH = get_secret("DATA_PATH", "data/financial_phrasebank_50agree.csv")
+STATS_COLLECTION = get_secret("STATS_COLLECTION", f"{COLLECTION_NAME}_meta")
 
 # -----------------------------
 #  Embedding Model Settings
@@ -27,6 +28,12 @@ DATA_PATH = get_secret("DATA_PATH", "data/financial_phrasebank_50agree.csv")
 EMBED_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 DEVICE = "cpu"
 
+# -----------------------------
+#  Ingest Deduplication Settings
+# -----------------------------
+DEDUP_ENABLED = str(get_secret("DEDUP_ENABLED", "true")).lower() in ("1", "true", "yes")
+DEDUP_THRESHOLD = float(get_secret("DEDUP_THRESHOLD", 0.95))
+
 # -----------------------------
 #  LLM Model Setting
 # -----------------------------
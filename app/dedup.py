@@ -0,0 +1,108 @@
+import hashlib
+import re
+from collections import Counter
+
+import numpy as np
+
+
+# ======================================
+# 🔹 Text Fingerprinting
+# ======================================
+def _fingerprint(text: str) -> str:
+    """Hash of a sentence after lowercasing and collapsing whitespace/punctuation spacing."""
+    s = re.sub(r"\s+", " ", str(text).lower()).strip()
+    s = re.sub(r"\s+([,.;:!?])", r"\1", s)
+    return hashlib.sha1(s.encode("utf-8")).hexdigest()
+
+
+def exact_groups(sentences):
+    """
+    Group row indices whose sentences are identical after normalization.
+    Returns a list of index lists, ordered by first occurrence.
+    """
+    groups = {}
+    for i, s in enumerate(sentences):
+        groups.setdefault(_fingerprint(s), []).append(i)
+    return list(groups.values())
+
+
+# ======================================
+# 🔹 Near-Duplicate Clustering
+# ======================================
+def near_duplicate_groups(embeddings, threshold=0.95, block_size=1024):
+    """
+    Cluster rows whose embeddings have cosine similarity >= threshold to a representative.
+    - Expects L2-normalized embeddings (dot product == cosine)
+    - Greedy leader clustering: the earliest unassigned row becomes a representative
+      and absorbs later unassigned rows similar to *it* (no transitive chaining)
+    - Compares in row blocks so memory stays at block_size x N
+    This is an exact O(N^2) all-pairs pass, sized for PhraseBank-scale corpora
+    (thousands of rows); million-row feeds would need candidate blocking (e.g. LSH) first.
+    Returns a list of index lists, ordered by representative.
+    """
+    vecs = np.asarray(embeddings, dtype=np.float32)
+    n = len(vecs)
+    assigned = np.zeros(n, dtype=bool)
+    clusters = []
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        sims = vecs[start:stop] @ vecs[start:].T
+        for r in range(stop - start):
+            i = start + r
+            if assigned[i]:
+                continue
+            # Slice past the diagonal: only rows after i, never i itself
+            hits = (sims[r, r + 1:] >= threshold) & ~assigned[i + 1:]
+            members = (np.nonzero(hits)[0] + i + 1).tolist()
+            assigned[i] = True
+            assigned[members] = True
+            clusters.append([i] + members)
+    return clusters
+
+
+# ======================================
+# 🔹 Full Dedup Stage
+# ======================================
+def deduplicate(sentences, sentiments, embeddings, threshold=0.95, block_size=1024):
+    """
+    Collapse exact and near-duplicate rows into one representative each.
+    Only the exact-hash stage merges rows with conflicting labels; cosine clustering
+    runs within each sentiment label so a "fell" sentence is never absorbed by a "rose" one.
+    Returns (kept_indices, payloads), where every payload carries:
+    - sentence: the representative (first-seen) sentence
+    - sentiment: the representative's own label (never overwritten by the cluster)
+    - count: number of source rows merged into this point
+    - labels: per-label counts across the cluster
+    """
+    # Stage 1: exact hash dedup (cheap, shrinks the similarity pass)
+    exact = exact_groups(sentences)
+    reps = [g[0] for g in exact]
+
+    # Stage 2: cosine clustering over the surviving representatives, per label
+    by_label = {}
+    for g, rep in enumerate(reps):
+        by_label.setdefault(sentiments[rep], []).append(g)
+
+    vecs = np.asarray(embeddings)
+    near = []
+    for groups in by_label.values():
+        sub = near_duplicate_groups(
+            vecs[[reps[g] for g in groups]], threshold=threshold, block_size=block_size
+        )
+        near.extend([groups[j] for j in cluster] for cluster in sub)
+    near.sort(key=lambda cluster: reps[cluster[0]])
+
+    kept, payloads = [], []
+    for cluster in near:
+        members = [i for c in cluster for i in exact[c]]
+        rep = reps[cluster[0]]
+        labels = Counter(sentiments[i] for i in members)
+        kept.append(rep)
+        payloads.append({
+            "sentence": sentences[rep],
+            "sentiment": sentiments[rep],
+            "count": len(members),
+            "labels": dict(labels),
+        })
+    return kept, payloads
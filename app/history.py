@@ -0,0 +1,7 @@
+HISTORY_LIMIT = 20       # max answers kept in session state
+HISTORY_PAGE = 5         # entries rendered per "Show more"
+
+
+def push_history(history, entry, limit=HISTORY_LIMIT):
+    """Return a new history list with entry first, capped at limit items."""
+    return [entry] + list(history)[:max(limit - 1, 0)]
@@ -1,14 +1,20 @@
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import io
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 from app.pipeline import RAGPipeline
+from app.retriever import load_corpus_stats
+from app.history import HISTORY_PAGE, push_history
 from qdrant_client import QdrantClient
 from app.config import QDRANT_URL, QDRANT_API_KEY
 import time
 
+STATUS_TTL = 60          # seconds between Qdrant status probes
+STATS_TTL = 300          # seconds before re-reading corpus stats from Qdrant
+
 # -------------------------------
 # PAGE CONFIG
 # -------------------------------
@@ -73,29 +79,121 @@ st.markdown("""
 st.divider()
 
 
+# -------------------------------
+# CACHED RESOURCES
+# -------------------------------
+@st.cache_resource(show_spinner=False)
+def get_qdrant_client():
+    """One cloud-safe Qdrant client per server process, shared with the pipeline."""
+    return QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+
+
+@st.cache_resource(show_spinner="Loading models...")
+def get_pipeline():
+    """Build the RAG stack once; returns (pipeline, load time in seconds)."""
+    start = time.time()
+    pipeline = RAGPipeline(client=get_qdrant_client())
+    return pipeline, time.time() - start
+
+
+@st.cache_data(ttl=STATUS_TTL, show_spinner=False)
+def qdrant_status():
+    """Collection names (or the error text) — probed at most once per TTL."""
+    try:
+        return [c.name for c in get_qdrant_client().get_collections().collections], None
+    except Exception as e:
+        return [], str(e)
+
+
+@st.cache_data(ttl=STATS_TTL, show_spinner=False)
+def corpus_stats():
+    """Corpus analytics stored in Qdrant at index time — re-read at most once per TTL."""
+    return load_corpus_stats(get_qdrant_client())
+
+
+@st.cache_data(show_spinner=False)
+def render_sentiment_chart(counts: tuple):
+    """Render the context sentiment bar chart to PNG bytes, cached per distinct count tuple."""
+    counts = pd.Series(counts, index=["positive", "neutral", "negative"])
+    total = counts.sum()
+    percentages = (counts / total * 100).round(1)
+
+    colors = {"positive": "#4CAF50", "neutral": "#9E9E9E", "negative": "#F44336"}
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    bars = ax.bar(
+        counts.index,
+        counts.values,
+        color=[colors.get(s, "#9E9E9E") for s in counts.index],
+        edgecolor="black",
+        linewidth=0.8,
+        alpha=0.9
+    )
+
+    for bar, pct in zip(bars, percentages):
+        height = bar.get_height()
+        ax.text(
+            bar.get_x() + bar.get_width() / 2,
+            height + 0.05,
+            f"{int(height)} ({pct}%)",
+            ha="center",
+            va="bottom",
+            fontsize=10,
+            fontweight="bold"
+        )
+
+    ax.set_title("Context Sentiment Breakdown", fontsize=14, fontweight="bold", color="#1F4E79")
+    ax.set_xlabel("Sentiment", fontsize=12, color="#333")
+    ax.set_ylabel("Frequency", fontsize=12, color="#333")
+    ax.set_facecolor("#F9FAFB")
+    fig.patch.set_facecolor("#F9FAFB")
+    ax.grid(axis="y", linestyle="--", alpha=0.3)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", facecolor=fig.get_facecolor())
+    plt.close(fig)
+    return buf.getvalue()
+
+
+# Reruns only the decorated block when its own widgets change (no-op on older Streamlit)
+fragment = getattr(st, "fragment", lambda f: f)
+
+
 # -------------------------------
 # SIDEBAR — SYSTEM STATUS
 # -------------------------------
 with st.sidebar:
     st.header("System Status")
 
-    try:
-        # Cloud-safe Qdrant connection
-        client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
-        collections = [c.name for c in client.get_collections().collections]
-        if collections:
-            st.success(f"Qdrant Connected ({len(collections)} collections)")
-        else:
-            st.warning("Connected — but no collections found")
-    except Exception as e:
-        st.error(f"Qdrant Offline\n{e}")
+    collections, error = qdrant_status()
+    if error:
+        st.error(f"Qdrant Offline\n{error}")
+    elif collections:
+        st.success(f"Qdrant Connected ({len(collections)} collections)")
+    else:
+        st.warning("Connected — but no collections found")
 
     st.subheader("Model Status")
-    start = time.time()
-    pipeline = RAGPipeline()
-    elapsed = time.time() - start
+    pipeline, elapsed = get_pipeline()
     st.success(f"Model ready in {elapsed:.1f}s")
 
+    st.subheader("Corpus Stats")
+    stats = corpus_stats()
+    if stats:
+        st.caption(
+            f"{stats['indexed']} indexed of {stats['rows']} rows "
+            f"(-{stats['reduction_pct']}% duplicates) · built {stats['built_at']}"
+        )
+        st.bar_chart(
+            pd.Series(stats["sentiment_counts"])
+            .reindex(["positive", "neutral", "negative"])
+            .fillna(0)
+        )
+    else:
+        st.info("No corpus stats yet — build the index.")
+
     st.markdown("---")
     st.markdown("""
     **Developed by [Hrishitaa Dharmavarapu](https://www.linkedin.com/in/hrishitaa-dharmavarapu-ln-3420a8205)**  
@@ -124,6 +222,13 @@ build_clicked = st.button("Build / Rebuild Index")
 if build_clicked:
     with st.spinner("Indexing financial dataset into Qdrant..."):
         pipeline.retriever.build_index()
+    qdrant_status.clear()
+    corpus_stats.clear()
+    # Redraw from the top so the sidebar picks up the fresh status and stats
+    st.session_state["index_built"] = True
+    st.rerun()
+
+if st.session_state.pop("index_built", False):
     st.success("Index built successfully.")
 
 # -------------------------------
@@ -133,7 +238,8 @@ if ask_clicked and query.strip():
     with st.spinner("Processing query using Gemini..."):
         result = pipeline.query(query)
         st.session_state["result"] = result
-        st.session_state["history"].insert(0, result)
+        st.session_state["history"] = push_history(st.session_state["history"], result)
+        st.session_state["history_shown"] = HISTORY_PAGE
 
 # -------------------------------
 # DISPLAY RESULT
@@ -153,53 +259,30 @@ if st.session_state["result"]:
     st.markdown("### Sentiment Distribution")
     sentiments = [d.get("sentiment", "neutral") for d in r["context"]]
     counts = pd.Series(sentiments).value_counts().reindex(["positive", "neutral", "negative"]).fillna(0)
-    total = counts.sum()
-    percentages = (counts / total * 100).round(1)
-
-    colors = {"positive": "#4CAF50", "neutral": "#9E9E9E", "negative": "#F44336"}
-
-    fig, ax = plt.subplots(figsize=(6, 4))
-    bars = ax.bar(
-        counts.index,
-        counts.values,
-        color=[colors.get(s, "#9E9E9E") for s in counts.index],
-        edgecolor="black",
-        linewidth=0.8,
-        alpha=0.9
-    )
-
-    for bar, pct in zip(bars, percentages):
-        height = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width() / 2,
-            height + 0.05,
-            f"{int(height)} ({pct}%)",
-            ha="center",
-            va="bottom",
-            fontsize=10,
-            fontweight="bold"
-        )
-
-    ax.set_title("Context Sentiment Breakdown", fontsize=14, fontweight="bold", color="#1F4E79")
-    ax.set_xlabel("Sentiment", fontsize=12, color="#333")
-    ax.set_ylabel("Frequency", fontsize=12, color="#333")
-    ax.set_facecolor("#F9FAFB")
-    fig.patch.set_facecolor("#F9FAFB")
-    ax.grid(axis="y", linestyle="--", alpha=0.3)
-    for spine in ax.spines.values():
-        spine.set_visible(False)
-
-    st.pyplot(fig)
+    st.image(render_sentiment_chart(tuple(int(c) for c in counts.values)))
 
 # -------------------------------
 # RECENT QUESTIONS HISTORY
 # -------------------------------
-if st.session_state["history"]:
+@fragment
+def render_history():
+    history = st.session_state["history"]
+    shown = st.session_state.setdefault("history_shown", HISTORY_PAGE)
     st.markdown("### Recent Questions")
-    for i, entry in enumerate(st.session_state["history"][:5], 1):
+    for i, entry in enumerate(history[:shown], 1):
         st.markdown(f"**{i}. Q:** {entry['query']}")
         st.markdown(f"**A:** {entry['answer']}")
         st.divider()
+    if shown < len(history) and st.button("Show more", key="history_more"):
+        st.session_state["history_shown"] = shown + HISTORY_PAGE
+        if hasattr(st, "fragment"):
+            st.rerun(scope="fragment")
+        else:
+            st.rerun()
+
+
+if st.session_state["history"]:
+    render_history()
 
 # -------------------------------
 # FOOTER
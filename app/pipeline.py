@@ -9,8 +9,8 @@ class RAGPipeline:
     Retrieves financial context via Qdrant and uses Gemini to synthesize insights.
     """
 
-    def __init__(self):
-        self.retriever = Retriever()
+    def __init__(self, client=None):
+        self.retriever = Retriever(client=client)
         self.generator = Generator()
 
     def query(self, question: str):
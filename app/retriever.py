@@ -3,8 +3,11 @@ from sentence_transformers import SentenceTransformer
 import pandas as pd
 from functools import lru_cache
 from app.config import *
+from app.dedup import deduplicate
 from textblob import TextBlob
 import re
+import time
+from datetime import datetime, timezone
 
 
 # ======================================
@@ -40,25 +43,46 @@ def _normalize_label(lbl: str) -> str:
     return "neutral"
 
 
+# ======================================
+# 🔹 Corpus Stats (precomputed at index time)
+# ======================================
+STATS_POINT_ID = 1
+
+
+def load_corpus_stats(client, collection=STATS_COLLECTION):
+    """Read the corpus analytics written by build_index, or None if not built yet."""
+    try:
+        points = client.retrieve(collection_name=collection, ids=[STATS_POINT_ID])
+    except Exception:
+        return None
+    if not points or not isinstance(points[0].payload, dict):
+        return None
+    return dict(points[0].payload)
+
+
 # ======================================
 # 🔹 Retriever Class
 # ======================================
 class Retriever:
-    def __init__(self):
-        """Initialize Qdrant connection and model."""
-        try:
-            # ✅ Use secure Qdrant Cloud endpoint + API key
-            self.client = QdrantClient(
-                url=QDRANT_URL,
-                api_key=QDRANT_API_KEY,
-            )
-            print(f"🔗 Connected to Qdrant Cloud at {QDRANT_URL}")
-        except Exception as e:
-            print(f"❌ Qdrant connection failed: {e}")
-            raise
+    def __init__(self, client=None):
+        """Initialize Qdrant connection (or reuse a shared client) and model."""
+        if client is not None:
+            self.client = client
+        else:
+            try:
+                # ✅ Use secure Qdrant Cloud endpoint + API key
+                self.client = QdrantClient(
+                    url=QDRANT_URL,
+                    api_key=QDRANT_API_KEY,
+                )
+                print(f"🔗 Connected to Qdrant Cloud at {QDRANT_URL}")
+            except Exception as e:
+                print(f"❌ Qdrant connection failed: {e}")
+                raise
 
         self.model = get_encoder()
         self.collection = COLLECTION_NAME
+        self.stats_collection = STATS_COLLECTION
         self._init_collection()
 
     # ------------------------------
@@ -111,12 +135,15 @@ class Retriever:
     # ------------------------------
     # ⚡ Build / Rebuild Index
     # ------------------------------
-    def build_index(self, data_path=DATA_PATH):
+    def build_index(self, data_path=DATA_PATH, dedup=DEDUP_ENABLED, threshold=DEDUP_THRESHOLD):
         """
         Build or rebuild embeddings index from CSV data.
         - Loads Financial PhraseBank
         - Normalizes labels
+        - Collapses exact + near-duplicate sentences (if dedup)
         - Uploads embeddings + payloads to Qdrant
+        - Saves corpus sentiment stats to a sibling collection (STATS_COLLECTION)
+        Returns ingest stats (row counts, size reduction, search latency).
         """
         print(f"📂 Loading dataset from: {data_path}")
         df = pd.read_csv(data_path)
@@ -159,16 +186,35 @@ class Retriever:
             show_progress_bar=True,
         )
 
-        # Prepare payload
-        payload = [{"sentence": s, "sentiment": sentiments[i]} for i, s in enumerate(sentences)]
+        # Prepare payload (one representative per duplicate cluster)
+        if dedup:
+            print(f"🧬 Deduplicating (cosine >= {threshold})...")
+            kept, payload = deduplicate(sentences, sentiments, embeddings, threshold=threshold)
+            vectors = embeddings[kept]
+        else:
+            payload = [
+                {"sentence": s, "sentiment": sentiments[i], "count": 1, "labels": {sentiments[i]: 1}}
+                for i, s in enumerate(sentences)
+            ]
+            vectors = embeddings
+
+        stats = {
+            "dedup": bool(dedup),
+            "threshold": threshold if dedup else None,
+            "rows": len(sentences),
+            "indexed": len(payload),
+            "reduction_pct": round(100 * (1 - len(payload) / max(len(sentences), 1)), 1),
+        }
+        print(f"📉 Index size: {stats['rows']} → {stats['indexed']} points (-{stats['reduction_pct']}%)")
 
         # Upload to Qdrant Cloud
-        print(f"🚀 Uploading {len(sentences)} sentences to Qdrant Cloud...")
+        print(f"🚀 Uploading {len(payload)} sentences to Qdrant Cloud...")
         try:
             self.client.upload_collection(
                 collection_name=self.collection,
-                vectors=embeddings,
+                vectors=vectors,
                 payload=payload,
+                wait=True,
             )
             print("✅ Upload complete.")
         except Exception as e:
@@ -183,6 +229,54 @@ class Retriever:
         except Exception as e:
             print(f"⚠️ Verification failed: {e}")
 
+        # Probe retrieval latency on the new index; this measures one index only, so
+        # compare against a second build with DEDUP_ENABLED flipped to see the effect
+        stats["search_latency_ms"] = self._probe_latency(vectors[:20])
+        print(f"⏱️ Mean search latency (top-12): {stats['search_latency_ms']} ms")
+
+        # Persist corpus-level analytics so the dashboard never rescans the collection
+        self._save_corpus_stats({
+            **stats,
+            "collection": self.collection,
+            "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "sentiment_counts": {k: int(v) for k, v in pre_counts.items()},
+            "indexed_sentiment_counts": {
+                k: int(v) for k, v in pd.Series([p["sentiment"] for p in payload]).value_counts().items()
+            },
+        })
+        return stats
+
+    def _save_corpus_stats(self, corpus_stats):
+        """Store corpus analytics as the payload of a single point in the sibling stats collection."""
+        try:
+            self.client.recreate_collection(
+                collection_name=self.stats_collection,
+                vectors_config=models.VectorParams(size=1, distance=models.Distance.DOT),
+            )
+            self.client.upsert(
+                collection_name=self.stats_collection,
+                points=[models.PointStruct(id=STATS_POINT_ID, vector=[1.0], payload=corpus_stats)],
+                wait=True,
+            )
+            print(f"💾 Corpus stats saved to collection '{self.stats_collection}'")
+        except Exception as e:
+            print(f"⚠️ Could not save corpus stats: {e}")
+
+    def _probe_latency(self, probes, top_k=12):
+        """Average wall-clock time of a top-k search over the given query vectors."""
+        if len(probes) == 0:
+            return None
+        try:
+            # Untimed warm-up so connection setup isn't counted
+            self.client.search(collection_name=self.collection, query_vector=probes[0], limit=top_k)
+            start = time.perf_counter()
+            for v in probes:
+                self.client.search(collection_name=self.collection, query_vector=v, limit=top_k)
+        except Exception as e:
+            print(f"⚠️ Latency probe failed: {e}")
+            return None
+        return round(1000 * (time.perf_counter() - start) / len(probes), 2)
+
     # ------------------------------
     # 🔍 Search
     # ------------------------------
@@ -0,0 +1,32 @@
+from unittest.mock import MagicMock
+from qdrant_client import QdrantClient
+from app.retriever import Retriever, load_corpus_stats
+
+
+def test_load_corpus_stats_missing_collection():
+    client = MagicMock()
+    client.retrieve.side_effect = Exception("Collection not found")
+    assert load_corpus_stats(client, "missing_meta") is None
+
+
+def test_load_corpus_stats_no_stats_point():
+    client = MagicMock()
+    client.retrieve.return_value = []
+    assert load_corpus_stats(client, "empty_meta") is None
+
+
+def test_load_corpus_stats_invalid_payload():
+    client = MagicMock()
+    client.retrieve.return_value = [MagicMock(payload=None)]
+    assert load_corpus_stats(client, "broken_meta") is None
+
+
+def test_corpus_stats_round_trip(tmp_path):
+    retriever = Retriever.__new__(Retriever)
+    retriever.client = QdrantClient(path=str(tmp_path))
+    retriever.stats_collection = "test_meta"
+
+    stats = {"rows": 4, "indexed": 2, "reduction_pct": 50.0, "sentiment_counts": {"positive": 1, "negative": 3}}
+    retriever._save_corpus_stats(stats)
+
+    assert load_corpus_stats(retriever.client, "test_meta") == stats
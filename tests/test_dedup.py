@@ -0,0 +1,114 @@
+import numpy as np
+from unittest.mock import MagicMock
+from app.dedup import deduplicate, exact_groups, near_duplicate_groups
+from app.retriever import Retriever
+
+
+def _unit(rows):
+    v = np.asarray(rows, dtype=np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def test_exact_groups_ignores_case_and_spacing():
+    groups = exact_groups(["Sales rose .", "sales  rose.", "Profit fell ."])
+    assert groups == [[0, 1], [2]]
+
+
+def test_near_duplicate_groups_across_blocks():
+    emb = _unit([[1, 0], [0.999, 0.01], [0, 1], [1, 0.001]])
+    groups = near_duplicate_groups(emb, threshold=0.99, block_size=2)
+    assert groups == [[0, 1, 3], [2]]
+
+
+def test_near_duplicate_groups_does_not_chain():
+    # 0~1 and 1~2 pass the threshold, but 0 and 2 do not
+    angles = np.radians([0, 10, 20])
+    emb = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    groups = near_duplicate_groups(emb, threshold=np.cos(np.radians(12)))
+    assert groups == [[0, 1], [2]]
+
+
+def test_deduplicate_exact_stage_merges_conflicting_labels():
+    sentences = ["Sales rose .", "sales rose.", "Profit fell ."]
+    sentiments = ["neutral", "positive", "negative"]
+    emb = _unit([[1, 0], [1, 0], [0, 1]])
+
+    kept, payloads = deduplicate(sentences, sentiments, emb, threshold=0.99)
+    assert kept == [0, 2]
+    assert payloads[0]["count"] == 2
+    assert payloads[0]["labels"] == {"neutral": 1, "positive": 1}
+    assert payloads[0]["sentiment"] == "neutral"
+    assert payloads[1]["count"] == 1
+
+
+def test_deduplicate_near_stage_stays_within_label():
+    sentences = [
+        "Operating profit rose to EUR 5 mn .",
+        "Operating profit rose to EUR 6 mn .",
+        "Operating profit fell to EUR 5 mn .",
+    ]
+    sentiments = ["positive", "positive", "negative"]
+    emb = _unit([[1, 0], [0.999, 0.01], [0.998, 0.02]])
+
+    kept, payloads = deduplicate(sentences, sentiments, emb, threshold=0.99)
+    assert kept == [0, 2]
+    assert payloads[0]["labels"] == {"positive": 2}
+    assert payloads[1]["sentiment"] == "negative"
+    assert payloads[1]["count"] == 1
+
+
+def _stub_retriever(monkeypatch, embeddings):
+    retriever = Retriever.__new__(Retriever)
+    retriever.collection = "test_docs"
+    retriever.client = MagicMock()
+    retriever.client.scroll.return_value = ([], None)
+    retriever.model = MagicMock()
+    retriever.model.encode.return_value = embeddings
+    monkeypatch.setattr(retriever, "_recreate_collection_hard", lambda: None)
+    monkeypatch.setattr(retriever, "_save_corpus_stats", lambda *a, **k: None)
+    return retriever
+
+
+def _write_csv(tmp_path):
+    # Same column layout as data/financial_phrasebank_50agree.csv
+    path = tmp_path / "phrases.csv"
+    path.write_text(
+        "sentence,label\n"
+        "positive,Sales rose .\n"
+        "neutral,sales rose.\n"
+        "negative,Profit fell .\n"
+        "negative,Profit dropped .\n"
+    )
+    return str(path)
+
+
+def test_build_index_uploads_deduplicated_points(monkeypatch, tmp_path):
+    emb = _unit([[1, 0], [1, 0], [0, 1], [0.01, 1]])
+    retriever = _stub_retriever(monkeypatch, emb)
+
+    stats = retriever.build_index(_write_csv(tmp_path), dedup=True, threshold=0.95)
+
+    kwargs = retriever.client.upload_collection.call_args.kwargs
+    assert kwargs["wait"] is True
+    assert [p["sentence"] for p in kwargs["payload"]] == ["Sales rose .", "Profit fell ."]
+    assert [p["count"] for p in kwargs["payload"]] == [2, 2]
+    np.testing.assert_array_equal(kwargs["vectors"], emb[[0, 2]])
+    assert stats["rows"] == 4
+    assert stats["indexed"] == 2
+    assert stats["reduction_pct"] == 50.0
+    assert stats["dedup"] is True
+
+
+def test_build_index_without_dedup_uploads_every_row(monkeypatch, tmp_path):
+    emb = _unit([[1, 0], [1, 0], [0, 1], [0.01, 1]])
+    retriever = _stub_retriever(monkeypatch, emb)
+
+    stats = retriever.build_index(_write_csv(tmp_path), dedup=False)
+
+    kwargs = retriever.client.upload_collection.call_args.kwargs
+    assert len(kwargs["payload"]) == 4
+    assert all(p["count"] == 1 for p in kwargs["payload"])
+    np.testing.assert_array_equal(kwargs["vectors"], emb)
+    assert stats["indexed"] == 4
+    assert stats["reduction_pct"] == 0.0
+    assert stats["dedup"] is False
@@ -0,0 +1,14 @@
+from app.history import HISTORY_LIMIT, push_history
+
+
+def test_push_history_newest_first():
+    history = push_history([{"query": "a"}], {"query": "b"})
+    assert [h["query"] for h in history] == ["b", "a"]
+
+
+def test_push_history_capped_at_limit():
+    history = []
+    for i in range(HISTORY_LIMIT + 5):
+        history = push_history(history, {"query": str(i)})
+    assert len(history) == HISTORY_LIMIT
+    assert history[0]["query"] == str(HISTORY_LIMIT + 4)